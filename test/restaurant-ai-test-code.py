@@ -5,18 +5,103 @@
 使用外部 config.json 管理所有配置
 """
 
+import functools
 import json
+import mimetypes
+import os
 import re
 import time
+import orjson
+import pybase64
 import requests
+from concurrent.futures import ThreadPoolExecutor, wait
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
-import base64
+from urllib.parse import urlsplit
+import string
+
+
+# 預編譯清理用的正則（七個移除規則合併為單一 alternation，只需掃描一次）
+_REMOVE_RE = re.compile(
+    r'(?:^已收\s*|^應收\s*'
+    r'|^說明：.*?\n|^解釋：.*?\n'
+    r'|^答案：\s*|\n已收$|\n應收$)',
+    re.MULTILINE
+)
+
+# 上述規則都錨定在行首（或 \n 之後），先用字串前綴/子字串檢查判斷是否需要跑正則
+_REMOVE_PREFIXES = ('已收', '應收', '說明：', '解釋：', '答案：')
+_REMOVE_LINE_PREFIXES = tuple('\n' + prefix for prefix in _REMOVE_PREFIXES)
+
+_FORMATTER = string.Formatter()
+
+# raw_decode 以 C 掃描器解析第一個完整 JSON 物件，之後的多餘文字（即使含有 }）會被忽略
+_JSON_DECODER = json.JSONDecoder()
+
+# LM Studio 健康檢查結果快取秒數
+_HEALTH_TTL = 30
+
+# 批次圖片測試支援的副檔名
+_IMAGE_SUFFIXES = (".jpg", ".jpeg", ".png")
+
+# 交易必要欄位（tuple 保留報錯順序，frozenset 供一次性差集檢查）
+_REQUIRED_FIELD_ORDER = ("type", "category", "amount", "status")
+_REQUIRED_FIELDS = frozenset(_REQUIRED_FIELD_ORDER)
+
+# 圖片分塊讀取大小（3 的倍數，確保各塊 base64 結果可直接串接）
+_IMAGE_CHUNK_SIZE = 57 * 1024
+
+# 單張圖片編碼結果快取筆數（供反覆調整提示詞時重送同一張收據）
+_IMAGE_CACHE_SIZE = 4
+
+
+def _encode_image(image_path: str) -> str:
+    """分塊讀取圖片並編碼為 data URL（MIME 類型依副檔名判斷，無法判斷時視為 JPEG）"""
+    mime_type = mimetypes.guess_type(image_path)[0] or "image/jpeg"
+    buf = bytearray(f"data:{mime_type};base64,".encode('ascii'))
+    with open(image_path, 'rb') as f:
+        while chunk := f.read(_IMAGE_CHUNK_SIZE):
+            buf += pybase64.b64encode(chunk)
+    return buf.decode('ascii')
+
+
+@functools.lru_cache(maxsize=_IMAGE_CACHE_SIZE)
+def _encode_image_cached(image_path: str, mtime: float, size: int) -> str:
+    """
+    以 (路徑, mtime, 大小) 為快取鍵的 _encode_image，同一張圖重複測試時不必重新讀檔與編碼
+    
+    每筆都是完整的 base64 data URL，快取只保留少數幾張；批次處理不走快取
+    """
+    return _encode_image(image_path)
+
+
+def _is_simple_template(parsed: List[Tuple[str, Any, Any, Any]]) -> bool:
+    """模板是否只含具名欄位且格式規格中沒有巢狀 {}（可由 get_prompt 直接組合）"""
+    for _, field_name, format_spec, _ in parsed:
+        if field_name is None:
+            continue
+        first = re.split(r'[.\[]', field_name, maxsplit=1)[0]
+        if not first or first.isdigit() or '{' in format_spec:
+            return False
+    return True
+
+
+def _needs_cleanup(text: str) -> bool:
+    """快速判斷 _REMOVE_RE 是否可能匹配（不進正則引擎）"""
+    if text.startswith(_REMOVE_PREFIXES):
+        return True
+    return any(prefix in text for prefix in _REMOVE_LINE_PREFIXES)
+
 
 class ConfigManager:
     """配置管理器 - Linus 認可的單一職責設計"""
     
+    # 已解析配置快取：(路徑, mtime) → 配置內容，檔案未變更時不重新解析
+    _CACHE: Dict[Tuple[str, float], Dict[str, Any]] = {}
+    
     def __init__(self, config_path: str = "config.json"):
         """
         初始化配置管理器
@@ -29,15 +114,23 @@ class ConfigManager:
         self._validate_config()
     
     def _load_config(self) -> Dict[str, Any]:
-        """載入配置文件"""
+        """載入配置文件（依 mtime 快取解析結果）"""
         try:
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            st = os.stat(self.config_path)
+            self._cache_key = (self.config_path, st.st_mtime)
+            cached = self._CACHE.get(self._cache_key)
+            if cached is not None:
+                return cached
+            
+            with open(self.config_path, 'rb') as f:
+                config = orjson.loads(f.read())
+            self._CACHE[self._cache_key] = config
+            return config
         except FileNotFoundError:
             print(f"❌ 配置文件不存在: {self.config_path}")
             print("提示: 請確保 config.json 在程式執行目錄")
             raise
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             print(f"❌ 配置文件格式錯誤: {str(e)}")
             raise
     
@@ -52,6 +145,41 @@ class ConfigManager:
         # 驗證模型配置
         if "text" not in self.config["models"] or "image" not in self.config["models"]:
             raise ValueError("配置文件缺少模型定義: text 或 image")
+        
+        # 預先攤平成 {鍵路徑: 值}，get() 只需一次 dict 查找
+        self._flat: Dict[Tuple[str, ...], Any] = {}
+        self._flatten(self.config, ())
+        
+        # 預先建立 分類 → 預期狀態 對照表
+        self.status_by_category: Dict[str, str] = {
+            category: rule.get("status", "已付")
+            for category, rule in (self.config.get("settlement_rules") or {}).items()
+        }
+        
+        # 預先解析提示詞模板，get_prompt() 不必每次重新掃描大括號
+        self._parsed_prompts: Dict[str, Optional[List[Tuple[str, Any, Any, Any]]]] = {}
+        self._literal_prompts: Dict[str, str] = {}
+        for name, template in self.config["prompts"].items():
+            try:
+                parsed = list(_FORMATTER.parse(template))
+            except ValueError:
+                # 格式錯誤的模板留到 get_prompt() 時由 format() 報錯
+                parsed = None
+            if parsed is not None and not _is_simple_template(parsed):
+                # 巢狀格式規格或位置參數交給 format() 處理，確保行為與錯誤完全一致
+                parsed = None
+            self._parsed_prompts[name] = parsed
+            
+            # 沒有任何欄位的模板（{{ }} 只是跳脫）預先組好結果，get_prompt() 直接回傳
+            if parsed is not None and all(field is None for _, field, _, _ in parsed):
+                self._literal_prompts[name] = ''.join(literal for literal, _, _, _ in parsed)
+    
+    def _flatten(self, value: Any, path: Tuple[str, ...]) -> None:
+        """遞迴記錄每個子樹的鍵路徑"""
+        self._flat[path] = value
+        if isinstance(value, dict):
+            for key, child in value.items():
+                self._flatten(child, path + (key,))
     
     def get(self, *keys: str, default: Any = None) -> Any:
         """
@@ -61,13 +189,7 @@ class ConfigManager:
             config.get("models", "text")  → "google/gemma-3-1b"
             config.get("api", "endpoint") → "http://localhost:1234/..."
         """
-        value = self.config
-        for key in keys:
-            if isinstance(value, dict) and key in value:
-                value = value[key]
-            else:
-                return default
-        return value
+        return self._flat.get(keys, default)
     
     def get_prompt(self, prompt_type: str, **kwargs) -> str:
         """
@@ -84,8 +206,23 @@ class ConfigManager:
         if template is None:
             raise ValueError(f"未找到提示詞: {prompt_type}")
         
+        literal = self._literal_prompts.get(prompt_type)
+        if literal is not None:
+            return literal
+        
         # 替換佔位符
-        return template.format(**kwargs)
+        parsed = self._parsed_prompts.get(prompt_type)
+        if parsed is None:
+            return template.format(**kwargs)
+        
+        parts = []
+        for literal, field_name, format_spec, conversion in parsed:
+            parts.append(literal)
+            if field_name is not None:
+                value, _ = _FORMATTER.get_field(field_name, (), kwargs)
+                value = _FORMATTER.convert_field(value, conversion)
+                parts.append(_FORMATTER.format_field(value, format_spec))
+        return ''.join(parts)
 
 
 class RestaurantAI:
@@ -102,14 +239,87 @@ class RestaurantAI:
         self.config = ConfigManager(config_path)
         self.test_results = []
         
-        # 從配置載入 API 端點
-        self.api_url = self.config.get("api", "endpoint")
+        # 從配置載入 API 端點、模型與參數
+        self._load_settings()
+        
+        # 共用連線池，避免每次請求重新建立 TCP 連線；連線失敗時快速重試一次
+        self._session = requests.Session()
+        self._session.mount("http://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(total=1, connect=1, backoff_factor=0.1)
+        ))
         
         print(f"✅ 配置已載入: {config_path}")
-        print(f"  文字模型: {self.config.get('models', 'text')}")
-        print(f"  圖片模型: {self.config.get('models', 'image')}")
+        print(f"  文字模型: {self._text_model}")
+        print(f"  圖片模型: {self._image_model}")
         print(f"  API端點: {self.api_url}")
     
+    def _load_settings(self) -> None:
+        """將每次請求都會用到的配置值快取在實例上（初始化與重新載入時呼叫）"""
+        self.api_url = self.config.get("api", "endpoint")
+        self._models_url = self._build_models_url(self.api_url)
+        self._timeout = self.config.get("api", "timeout", default=60)
+        self._stream = bool(self.config.get("api", "stream", default=False))
+        self._text_model = self.config.get("models", "text")
+        self._image_model = self.config.get("models", "image")
+        self._text_params = self.config.get("parameters", "text") or {}
+        self._image_params = self.config.get("parameters", "image") or {}
+        # 端點可能已變更，清掉舊的健康檢查結果
+        self._health: Optional[Tuple[float, Dict[str, Any]]] = None
+    
+    @staticmethod
+    def _build_models_url(api_url: str) -> str:
+        """由聊天端點推導模型列表端點（非標準路徑時改用 <scheme>://<host>/v1/models）"""
+        suffix = "/chat/completions"
+        base = api_url.rstrip("/")
+        if base.endswith(suffix):
+            return base[:-len(suffix)] + "/models"
+        parts = urlsplit(api_url)
+        return f"{parts.scheme}://{parts.netloc}/v1/models"
+    
+    def check_health(self) -> Dict[str, Any]:
+        """
+        檢查 LM Studio 連線並列出已載入模型（結果快取 _HEALTH_TTL 秒）
+        
+        Returns:
+            {"success": bool, "models": [...]} 或 {"success": False, "error": ...}
+        """
+        now = time.time()
+        if self._health is not None and now - self._health[0] < _HEALTH_TTL:
+            return self._health[1]
+        
+        try:
+            response = self._session.get(self._models_url, timeout=5)
+            if response.status_code == 200:
+                models_data = orjson.loads(response.content)
+                health = {
+                    "success": True,
+                    "models": [m.get("id") for m in models_data.get("data", [])]
+                }
+            else:
+                health = {"success": False, "error": f"API錯誤: {response.status_code}"}
+        except Exception as e:
+            health = {"success": False, "error": f"無法連接到 LM Studio: {str(e)}"}
+        
+        self._health = (now, health)
+        return health
+    
+    def close(self) -> None:
+        """關閉共用的 HTTP 連線池"""
+        self._session.close()
+    
+    def __enter__(self) -> "RestaurantAI":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def __del__(self) -> None:
+        session = getattr(self, "_session", None)
+        if session is not None:
+            session.close()
+    
     def process_text_lm_studio(self, user_input: str) -> Dict[str, Any]:
         """使用配置文件中的設定處理文字輸入"""
         
@@ -122,9 +332,9 @@ class RestaurantAI:
                 "error": f"提示詞生成失敗: {str(e)}"
             }
         
-        # ✅ 從配置獲取模型和參數
-        model = self.config.get("models", "text")
-        params = self.config.get("parameters", "text")
+        # ✅ 使用已快取的模型和參數（見 _load_settings）
+        model = self._text_model
+        params = self._text_params
         
         payload = {
             "model": model,
@@ -136,13 +346,57 @@ class RestaurantAI:
         
         return self._call_api(payload, "text")
     
-    def process_image_lm_studio(self, image_path: str) -> Dict[str, Any]:
-        """使用配置文件中的設定處理圖片輸入"""
+    def process_text_batch(self, inputs: List[str], max_wait_ms: Optional[int] = None,
+                           max_workers: int = 8) -> List[Dict[str, Any]]:
+        """
+        批次處理多筆文字輸入（共用連線池並行送出）
         
-        # 讀取並編碼圖片
+        Args:
+            inputs: 使用者輸入列表
+            max_wait_ms: 整批最長等待時間（毫秒），逾時未完成者回傳錯誤；None 表示不限
+            max_workers: 最大並行請求數
+        
+        Returns:
+            與 inputs 順序相同的處理結果列表
+        """
+        if not inputs:
+            return []
+        
+        executor = ThreadPoolExecutor(max_workers=min(max_workers, len(inputs)))
+        try:
+            futures = [executor.submit(self.process_text_lm_studio, text) for text in inputs]
+            timeout = max_wait_ms / 1000 if max_wait_ms is not None else None
+            wait(futures, timeout=timeout)
+            
+            results = []
+            for future in futures:
+                if future.done():
+                    results.append(future.result())
+                else:
+                    results.append({
+                        "success": False,
+                        "error": f"批次等待超時（>{max_wait_ms}毫秒）"
+                    })
+            return results
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def process_image_lm_studio(self, image_path: str, use_cache: bool = True) -> Dict[str, Any]:
+        """
+        使用配置文件中的設定處理圖片輸入
+        
+        Args:
+            image_path: 圖片路徑
+            use_cache: 是否使用編碼快取（依檔案 mtime/大小判斷）；只送一次的圖片應關閉
+        """
+        
+        # 分塊讀取並編碼圖片
         try:
-            with open(image_path, 'rb') as f:
-                image_data = base64.b64encode(f.read()).decode('utf-8')
+            if use_cache:
+                st = os.stat(image_path)
+                image_url = _encode_image_cached(image_path, st.st_mtime, st.st_size)
+            else:
+                image_url = _encode_image(image_path)
         except Exception as e:
             return {"success": False, "error": f"圖片讀取失敗: {str(e)}"}
         
@@ -155,9 +409,9 @@ class RestaurantAI:
                 "error": f"提示詞生成失敗: {str(e)}"
             }
         
-        # ✅ 從配置獲取模型和參數
-        model = self.config.get("models", "image")
-        params = self.config.get("parameters", "image")
+        # ✅ 使用已快取的模型和參數（見 _load_settings）
+        model = self._image_model
+        params = self._image_params
         
         payload = {
             "model": model,
@@ -168,7 +422,7 @@ class RestaurantAI:
                         {"type": "text", "text": prompt},
                         {
                             "type": "image_url",
-                            "image_url": {"url": f"data:image/jpeg;base64,{image_data}"}
+                            "image_url": {"url": image_url}
                         }
                     ]
                 }
@@ -179,6 +433,26 @@ class RestaurantAI:
         
         return self._call_api(payload, "image")
     
+    def process_images_batch(self, paths: List[str], max_workers: int = 4) -> List[Dict[str, Any]]:
+        """
+        並行處理多張圖片（讀檔、編碼與 HTTP 等待可互相重疊）
+        
+        Args:
+            paths: 圖片路徑列表
+            max_workers: 最大並行請求數
+        
+        Returns:
+            與 paths 順序相同的處理結果列表
+        """
+        if not paths:
+            return []
+        
+        # 批次中的圖片通常只送一次，不放進編碼快取以免佔住大量記憶體
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(paths))) as executor:
+            return list(executor.map(
+                lambda path: self.process_image_lm_studio(path, use_cache=False), paths
+            ))
+    
     def _call_api(self, payload: Dict[str, Any], input_type: str) -> Dict[str, Any]:
         """
         統一的 API 調用邏輯（消除重複代碼）
@@ -187,16 +461,36 @@ class RestaurantAI:
             payload: API 請求內容
             input_type: 輸入類型（text/image）
         """
-        timeout = self.config.get("api", "timeout", default=60)
+        timeout = self._timeout
+        stream = self._stream
+        if stream:
+            # OpenAI 相容伺服器預設不在串流中回傳 usage，需明確要求（會在最後一個 chunk 送出）
+            payload = {**payload, "stream": True, "stream_options": {"include_usage": True}}
         
         try:
+            # 只序列化一次成 bytes，requests 直接送出不再額外複製
+            body = orjson.dumps(payload)
+            
             start_time = time.time()
-            response = requests.post(self.api_url, json=payload, timeout=timeout)
-            end_time = time.time()
+            response = self._session.post(
+                self.api_url,
+                data=body,
+                headers={
+                    "Content-Type": "application/json",
+                    "Content-Length": str(len(body))
+                },
+                timeout=timeout,
+                stream=stream
+            )
             
             if response.status_code == 200:
-                result = response.json()
-                raw_content = result["choices"][0]["message"]["content"]
+                if stream:
+                    raw_content, usage = self._read_stream(response)
+                else:
+                    result = orjson.loads(response.content)
+                    raw_content = result["choices"][0]["message"]["content"]
+                    usage = result.get("usage", {})
+                end_time = time.time()
                 
                 return {
                     "success": True,
@@ -205,7 +499,7 @@ class RestaurantAI:
                     "raw_output": raw_content,
                     "processed_result": self.clean_output(raw_content),
                     "processing_time": end_time - start_time,
-                    "tokens_used": result.get("usage", {})
+                    "tokens_used": usage
                 }
             else:
                 return {
@@ -225,35 +519,71 @@ class RestaurantAI:
                 "error": f"請求失敗: {str(e)}"
             }
     
+    def _read_stream(self, response: requests.Response) -> Tuple[str, Dict[str, Any]]:
+        """
+        逐行解析 SSE 串流回應，組合 delta 內容
+        
+        Returns:
+            (完整輸出文字, token 使用量)
+        """
+        parts = []
+        usage = {}
+        try:
+            for line in response.iter_lines():
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[5:].strip()
+                if data == b"[DONE]":
+                    break
+                
+                chunk = orjson.loads(data)
+                choices = chunk.get("choices") or []
+                if choices:
+                    content = choices[0].get("delta", {}).get("content")
+                    if content:
+                        parts.append(content)
+                if chunk.get("usage"):
+                    usage = chunk["usage"]
+        finally:
+            response.close()
+        
+        return "".join(parts), usage
+    
     def clean_output(self, raw_output: str) -> Dict[str, Any]:
         """清理AI輸出，提取JSON部分"""
         
         cleaned = raw_output.strip()
         
-        # 移除常見的多餘文字
-        remove_patterns = [
-            r'^已收\s*', r'^應收\s*',
-            r'^說明：.*?\n', r'^解釋：.*?\n',
-            r'^答案：\s*', r'\n已收$', r'\n應收$'
-        ]
-        
-        for pattern in remove_patterns:
-            cleaned = re.sub(pattern, '', cleaned, flags=re.MULTILINE)
+        # 移除常見的多餘文字（重複替換到不再匹配，移除後新露出的行首前綴也會一併清掉）
+        if _needs_cleanup(cleaned):
+            count = 1
+            while count:
+                cleaned, count = _REMOVE_RE.subn('', cleaned)
         
         # 提取JSON
-        json_match = re.search(r'\{.*\}', cleaned, re.DOTALL)
-        if json_match:
-            json_str = json_match.group().strip()
-            try:
-                return {"success": True, "data": json.loads(json_str)}
-            except json.JSONDecodeError as e:
-                return {
-                    "success": False,
-                    "error": f"JSON解析錯誤: {str(e)}",
-                    "json_str": json_str
-                }
-        else:
+        start = cleaned.find('{')
+        if start == -1:
             return {"success": False, "error": "未找到JSON格式"}
+        
+        end = cleaned.rfind('}')
+        json_str = cleaned[start:end + 1] if end > start else cleaned[start:]
+        
+        # 常見情況：第一個 { 到最後一個 } 就是完整 JSON，直接交給 orjson
+        try:
+            return {"success": True, "data": orjson.loads(json_str)}
+        except orjson.JSONDecodeError:
+            pass
+        
+        # 後面還有多餘文字（可能含 }）時，只取第一個完整物件
+        try:
+            data, _ = _JSON_DECODER.raw_decode(cleaned, start)
+            return {"success": True, "data": data}
+        except json.JSONDecodeError as e:
+            return {
+                "success": False,
+                "error": f"JSON解析錯誤: {str(e)}",
+                "json_str": json_str.strip()
+            }
     
     def validate_result(self, result: Dict[str, Any], expected_amount: float = None) -> Dict[str, Any]:
         """驗證AI輸出結果"""
@@ -275,11 +605,12 @@ class RestaurantAI:
         
         for i, trans in enumerate(transactions):
             # 檢查必要欄位
-            required_fields = ["type", "category", "amount", "status"]
-            for field in required_fields:
-                if field not in trans:
-                    validation["issues"].append(f"交易{i+1}缺少{field}欄位")
-                    validation["valid"] = False
+            missing = _REQUIRED_FIELDS - trans.keys()
+            if missing:
+                for field in _REQUIRED_FIELD_ORDER:
+                    if field in missing:
+                        validation["issues"].append(f"交易{i+1}缺少{field}欄位")
+                validation["valid"] = False
             
             # 檢查金額
             if expected_amount and trans.get("amount") != expected_amount:
@@ -301,16 +632,13 @@ class RestaurantAI:
     
     def get_expected_status(self, category: str) -> str:
         """從配置文件獲取預期狀態"""
-        rules = self.config.get("settlement_rules")
-        if rules and category in rules:
-            return rules[category].get("status", "已付")
-        return "已付"
+        return self.config.status_by_category.get(category, "已付")
     
     def get_model_info(self) -> Dict[str, str]:
         """取得當前使用的模型資訊"""
         return {
-            "text_model": self.config.get("models", "text"),
-            "image_model": self.config.get("models", "image"),
+            "text_model": self._text_model,
+            "image_model": self._image_model,
             "api_endpoint": self.api_url,
             "config_file": self.config.config_path
         }
@@ -324,8 +652,10 @@ class RestaurantAI:
         """
         try:
             old_config_path = self.config.config_path
+            # 強制重新解析，避免 mtime 精度不足時讀到舊快取
+            ConfigManager._CACHE.pop(self.config._cache_key, None)
             self.config = ConfigManager(old_config_path)
-            self.api_url = self.config.get("api", "endpoint")
+            self._load_settings()
             print(f"✅ 配置已重新載入: {old_config_path}")
             return True
         except Exception as e:
@@ -347,22 +677,7 @@ def main():
         print("\n請確保 config.json 存在且格式正確")
         return
     
-    # 檢查 LM Studio 連接
-    try:
-        response = requests.get("http://localhost:1234/v1/models", timeout=5)
-        if response.status_code == 200:
-            print("\n✅ LM Studio 連接正常")
-            
-            models_data = response.json()
-            if "data" in models_data:
-                loaded_models = [m.get("id") for m in models_data["data"]]
-                print(f"✅ 已載入模型: {', '.join(loaded_models)}")
-        else:
-            print("\n❌ LM Studio 連接異常")
-            return
-    except:
-        print("\n❌ 無法連接到 LM Studio")
-        return
+    # 不在啟動時阻塞檢查 LM Studio，連線問題會在第一次請求時回報（選項 3 可查看連線狀態）
     
     # 測試選單
     while True:
@@ -373,9 +688,10 @@ def main():
         print("3. 查看模型資訊")
         print("4. 重新載入配置（不重啟程式）")
         print("5. 查看當前配置內容")
+        print("6. 批次圖片測試（整個資料夾）")
         print("0. 退出")
         
-        choice = input("\n請輸入選項 (0-5): ").strip()
+        choice = input("\n請輸入選項 (0-6): ").strip()
         
         if choice == "1":
             user_input = input("請輸入測試文字: ").strip()
@@ -415,6 +731,13 @@ def main():
             print(f"文字處理: {info['text_model']}")
             print(f"圖片處理: {info['image_model']}")
             print(f"API端點: {info['api_endpoint']}")
+            
+            health = ai.check_health()
+            if health["success"]:
+                print("✅ LM Studio 連接正常")
+                print(f"✅ 已載入模型: {', '.join(health['models'])}")
+            else:
+                print(f"❌ {health['error']}")
         
         elif choice == "4":
             print("\n重新載入配置中...")
@@ -437,6 +760,37 @@ def main():
                 for category, rule in rules.items():
                     print(f"  - {category}: {rule['status']} (入帳{rule['delay_days']}天)")
         
+        elif choice == "6":
+            image_dir = input("請輸入圖片資料夾路徑: ").strip()
+            if image_dir and Path(image_dir).is_dir():
+                image_paths = sorted(
+                    str(p) for p in Path(image_dir).iterdir()
+                    if p.suffix.lower() in _IMAGE_SUFFIXES
+                )
+                if not image_paths:
+                    print("資料夾內沒有圖片！")
+                    continue
+                
+                print(f"\n使用模型: {ai.config.get('models', 'image')}")
+                print(f"共 {len(image_paths)} 張圖片，並行處理中...")
+                start_time = time.time()
+                results = ai.process_images_batch(image_paths)
+                total_time = time.time() - start_time
+                
+                print("\n=== 批次圖片測試結果 ===")
+                for image_path, result in zip(image_paths, results):
+                    print(f"\n[{Path(image_path).name}]")
+                    if result.get("success"):
+                        print(f"原始輸出: {result.get('raw_output')}")
+                        print(f"處理時間: {result.get('processing_time', 0):.2f}秒")
+                    else:
+                        print(f"❌ {result.get('error')}")
+                
+                success_count = sum(1 for r in results if r.get("success"))
+                print(f"\n成功: {success_count}/{len(results)}，總耗時: {total_time:.2f}秒")
+            else:
+                print("資料夾不存在！")
+        
         elif choice == "0":
             print("退出測試程式")
             break
@@ -0,0 +1,34 @@
+# clean_output regression tests
+import importlib.util
+from pathlib import Path
+
+TEST_DIR = Path(__file__).parent
+
+_spec = importlib.util.spec_from_file_location(
+    "restaurant_ai_test_code", TEST_DIR / "restaurant-ai-test-code.py"
+)
+restaurant_ai = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(restaurant_ai)
+
+
+class TestCleanOutput:
+    """Testing for AI output cleanup and JSON extraction"""
+
+    def setup_method(self):
+        self.ai = restaurant_ai.RestaurantAI(str(TEST_DIR / "restaurant_config.json"))
+
+    def teardown_method(self):
+        self.ai.close()
+
+    def test_trailing_brace_after_json(self):
+        raw = '{"transactions": [{"type": "收入", "category": "現金", "amount": 100, "status": "已收"}]}\n備註：金額 {待確認}'
+        result = self.ai.clean_output(raw)
+        assert result["success"]
+        assert result["data"]["transactions"][0]["amount"] == 100
+
+    def test_brace_inside_string(self):
+        result = self.ai.clean_output('已收 {"note": "}{"} trailing }')
+        assert result == {"success": True, "data": {"note": "}{"}}
+
+    def test_no_json(self):
+        assert self.ai.clean_output("沒有資料")["error"] == "未找到JSON格式"